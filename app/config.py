@@ -6,16 +6,27 @@ class Settings(BaseSettings):
     # API Configuration
     TOGETHER_API_KEY: str
     MODEL_NAME: str = "meta-llama/Llama-3.3-70B-Instruct-Turbo"
+    LLM_MAX_RETRIES: int = 2
     
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     WORKERS: int = 4
     LOG_LEVEL: str = "info"
+    WARMUP_LLM: bool = True
+    WARMUP_LLM_TIMEOUT: float = 5.0  # seconds; keep well under gunicorn's worker timeout
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     
+    # Tracing
+    TRACE_EXPORT_PATH: str = ""  # OpenTelemetry JSON lines file; empty disables export
+    
+    # Text Extraction
+    PDF_BACKEND: str = "auto"  # "auto", "pymupdf" or "pypdf2"
+    EXTRACT_MAX_PAGES: int = 10
+    EXTRACT_MAX_CHARS: int = 20000
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
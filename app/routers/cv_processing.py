@@ -1,12 +1,11 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, Response
+from typing import Dict, List, Optional
 from pydantic import BaseModel
-from dotenv import load_dotenv
 import logging
-from app.services.cv_parser import ResumeParser
-from app.services.cv_ranker import CVRankingAssistant
+from app.services.lifecycle import ServiceState, get_services
+from app.services.text_extractor import supported_extensions
+from app.services.tracing import RequestTrace
 from app.config import get_settings
-import json
 
 import os
 # Configure logging
@@ -14,11 +13,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-load_dotenv()
-
-parser = ResumeParser(api_key=os.getenv("TOGETHER_API_KEY"))
-ranker = CVRankingAssistant(api_key=os.getenv("TOGETHER_API_KEY"), model_name=os.getenv("MODEL_NAME"))
-
 class ScoreBreakdown(BaseModel):
 
     Skills_Score: float
@@ -49,106 +43,161 @@ class ParsedDocument(BaseModel):
     content: dict
     score: CandidateScore = None
 
+class TraceFile(BaseModel):
+    filename: str
+    stages: Dict[str, float]
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    error: Optional[str] = None
+
+class TraceSummary(BaseModel):
+    trace_id: str
+    total_ms: float
+    stages: Dict[str, float]
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    files: List[TraceFile]
+
 class MultipleParseResponse(BaseModel):
     successful_parses: List[ParsedDocument]
     failed_files: List[dict]
+    trace: Optional[TraceSummary] = None
 
-@app.post("/parse-and-rank", response_model=MultipleParseResponse)
+@router.post("/parse-and-rank", response_model=MultipleParseResponse)
 async def parse_and_rank_documents(
+    response: Response,
     files: List[UploadFile] = File(...),
-    job_description: str = Form(...) 
+    job_description: str = Form(...),
+    include_trace: bool = Form(False),
+    services: ServiceState = Depends(get_services)
 ):
     logger.info(f"Received {len(files)} files for processing")
     logger.info(f"Received job description: {job_description}")
     
+    settings = get_settings()
+    allowed_extensions = tuple(
+        ext for ext in supported_extensions() if ext not in services.disabled_extensions
+    )
+    parser = services.parser
+    ranker = services.ranker
+    
     successful_parses = []
     failed_files = []
     
-    # Process all CVs first
-    for file in files:
-        if not file.filename.lower().endswith(('.pdf','.docx')):
-            failed_files.append({
-                "filename": file.filename,
-                "error": "Only PDF and DOCX files are supported"
-            })
-            continue
+    with RequestTrace("parse-and-rank") as trace:
+        # Process all CVs first
+        for file in files:
+            if not file.filename.lower().endswith(allowed_extensions):
+                failed_files.append({
+                    "filename": file.filename,
+                    "error": f"Only {', '.join(ext.lstrip('.').upper() for ext in allowed_extensions)} files are supported"
+                })
+                continue
 
-            
-        temp_path = f"temp_{file.filename}"
-        try:
-            # Save and process file
-            with open(temp_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            text = parser.extract_text_from_file(temp_path)
-            parse_type = "resume"
-            result = parser.parse_text(text, parse_type, MODEL_NAME)
-            
-            # Calculate score if job description is provided
-            score = None
-            if job_description:
+            temp_path = f"temp_{file.filename}"
+            with trace.span("file", file=file.filename):
                 try:
-                    job_desc_parsed = {
-                        "description": job_description
-                    }
-                    cv_for_scoring = {
-                        "id": file.filename,
-                        "content": result
-                    }
-                    score_result = ranker.rank_cvs(job_desc_parsed, [cv_for_scoring])
+                    # Save and process file
+                    with trace.span("upload_read") as span, open(temp_path, "wb") as buffer:
+                        content = await file.read()
+                        buffer.write(content)
+                        span.set_attribute("bytes", len(content))
                     
-                    if score_result and "Scores" in score_result and len(score_result["Scores"]) > 0:
-                        score_data = score_result["Scores"][0]
-                        score = CandidateScore(
-                            Overall_Score=score_data["Overall_Score"],
-                            Score_Breakdown=ScoreBreakdown(
-                                Skills_Score=score_data["Score_Breakdown"]["Skills_Score"],
-                                Experience_Score=score_data["Score_Breakdown"]["Experience_Score"],
-                                Education_Score=score_data["Score_Breakdown"]["Education_Score"],
-                                Certification_Score=score_data["Score_Breakdown"]["Certification_Score"]
-                            ),
-                            Evaluation=Evaluation(
-                                Pros=score_data["Evaluation"]["Pros"],
-                                Cons=score_data["Evaluation"]["Cons"],
-                                Job_Fit_Summary=score_data["Evaluation"]["Job_Fit_Summary"]
-                            ),
-                            Interview_Questions=InterviewQuestions(
-                                HR_Round=score_data["Interview_Questions"]["HR_Round"],
-                                Technical_Round=score_data["Interview_Questions"]["Technical_Round"],
-                                Cultural_Round=score_data["Interview_Questions"]["Cultural_Round"],
-                                Final_Round=score_data["Interview_Questions"]["Final_Round"]
-                            ),
-                            Recommendation=score_data["Recommendation"]
+                    with trace.span("extraction") as span:
+                        text = parser.extract_text_from_file(
+                            temp_path,
+                            max_pages=settings.EXTRACT_MAX_PAGES,
+                            max_chars=settings.EXTRACT_MAX_CHARS,
+                            pdf_backend=settings.PDF_BACKEND
                         )
+                        span.set_attribute("chars", len(text))
+                    
+                    parse_type = "resume"
+                    with trace.span("parse_llm"):
+                        result = parser.parse_text(text, parse_type, settings.MODEL_NAME)
+                    
+                    # Calculate score if job description is provided
+                    score = None
+                    if job_description:
+                        try:
+                            job_desc_parsed = {
+                                "description": job_description
+                            }
+                            cv_for_scoring = {
+                                "id": file.filename,
+                                "content": result
+                            }
+                            with trace.span("score_llm"):
+                                score_result = ranker.rank_cvs(job_desc_parsed, [cv_for_scoring])
+                            
+                            if score_result and "Scores" in score_result and len(score_result["Scores"]) > 0:
+                                score_data = score_result["Scores"][0]
+                                score = CandidateScore(
+                                    Overall_Score=score_data["Overall_Score"],
+                                    Score_Breakdown=ScoreBreakdown(
+                                        Skills_Score=score_data["Score_Breakdown"]["Skills_Score"],
+                                        Experience_Score=score_data["Score_Breakdown"]["Experience_Score"],
+                                        Education_Score=score_data["Score_Breakdown"]["Education_Score"],
+                                        Certification_Score=score_data["Score_Breakdown"]["Certification_Score"]
+                                    ),
+                                    Evaluation=Evaluation(
+                                        Pros=score_data["Evaluation"]["Pros"],
+                                        Cons=score_data["Evaluation"]["Cons"],
+                                        Job_Fit_Summary=score_data["Evaluation"]["Job_Fit_Summary"]
+                                    ),
+                                    Interview_Questions=InterviewQuestions(
+                                        HR_Round=score_data["Interview_Questions"]["HR_Round"],
+                                        Technical_Round=score_data["Interview_Questions"]["Technical_Round"],
+                                        Cultural_Round=score_data["Interview_Questions"]["Cultural_Round"],
+                                        Final_Round=score_data["Interview_Questions"]["Final_Round"]
+                                    ),
+                                    Recommendation=score_data["Recommendation"]
+                                )
+                        except Exception as e:
+                            logger.error(f"Error calculating score: {str(e)}")
+                            logger.exception("Detailed scoring error")
+                    
+                    successful_parses.append(ParsedDocument(
+                        filename=file.filename,
+                        content=result,
+                        score=score
+                    ))
+                    
                 except Exception as e:
-                    logger.error(f"Error calculating score: {str(e)}")
-                    logger.exception("Detailed scoring error")
-            
-            successful_parses.append(ParsedDocument(
-                filename=file.filename,
-                content=result,
-                score=score
-            ))
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {str(e)}")
-            logger.exception("Detailed processing error")
-            failed_files.append({
-                "filename": file.filename,
-                "error": str(e)
-            })
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+                    logger.error(f"Error processing file {file.filename}: {str(e)}")
+                    logger.exception("Detailed processing error")
+                    failed_files.append({
+                        "filename": file.filename,
+                        "error": str(e)
+                    })
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+    
+    summary = trace.summary()
+    headers = {
+        "Server-Timing": RequestTrace.server_timing(summary),
+        "X-Trace-Id": summary["trace_id"],
+        "X-LLM-Prompt-Tokens": str(summary["prompt_tokens"]),
+        "X-LLM-Completion-Tokens": str(summary["completion_tokens"])
+    }
+    logger.info(
+        f"Request trace {summary['trace_id']}: {summary['total_ms']}ms, "
+        f"{summary['prompt_tokens']} prompt / {summary['completion_tokens']} completion tokens"
+    )
                 
     if not successful_parses:
         raise HTTPException(
             status_code=500, 
-            detail="No files were successfully processed"
+            detail="No files were successfully processed",
+            headers=headers
         )
     
+    response.headers.update(headers)
     return MultipleParseResponse(
         successful_parses=successful_parses,
-        failed_files=failed_files
-    )
\ No newline at end of file
+        failed_files=failed_files,
+        trace=TraceSummary(**summary) if include_trace else None
+    )
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+router = APIRouter()
+
+class HealthResponse(BaseModel):
+    status: str
+    ready: bool
+    checks: Dict[str, str]
+    startup_seconds: Optional[float] = None
+
+def _health_payload(request: Request) -> HealthResponse:
+    # Lifespan builds and warms up services before the worker accepts connections,
+    # so services is only missing when the app runs without its lifespan
+    services = getattr(request.app.state, "services", None)
+    if services is None:
+        return HealthResponse(status="unavailable", ready=False, checks={})
+
+    if not services.ready:
+        status = "unavailable"
+    elif all(check in ("ok", "skipped") for check in services.checks.values()):
+        status = "ok"
+    else:
+        status = "degraded"
+
+    return HealthResponse(
+        status=status,
+        ready=services.ready,
+        checks=services.checks,
+        startup_seconds=services.startup_seconds
+    )
+
+@router.get("/health", response_model=HealthResponse)
+async def health(request: Request):
+    """Liveness: the worker process is up and serving requests."""
+    return _health_payload(request)
+
+@router.get("/ready", response_model=HealthResponse)
+async def ready(request: Request):
+    """Readiness: shared services are built and warmed up; 503 until then."""
+    payload = _health_payload(request)
+    return JSONResponse(
+        status_code=200 if payload.ready else 503,
+        content=payload.model_dump()
+    )
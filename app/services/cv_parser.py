@@ -1,76 +1,54 @@
+import json
+import logging
+import os
+from typing import Optional
+
+from fastapi import HTTPException
+from together import Together
+
+from app.services.text_extractor import extract_text, supported_extensions
+from app.services.llm_client import stream_completion
+
+logger = logging.getLogger(__name__)
+
 class ResumeParser:
-    def __init__(self, api_key, temperature=0.7, top_p=0.7, top_k=50, repetition_penalty=1):
+    def __init__(self, api_key=None, temperature=0.7, top_p=0.7, top_k=50, repetition_penalty=1, client=None,
+                 max_retries=2):
         logger.info("Initializing ResumeParser...")
-        try:
-            self.client = Together(api_key=api_key)
-            logger.info("Together client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Together client: {str(e)}")
-            raise
+        if client is not None:
+            self.client = client
+        else:
+            try:
+                # Retries are done (and counted) by stream_completion
+                self.client = Together(api_key=api_key, max_retries=0)
+                logger.info("Together client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Together client: {str(e)}")
+                raise
         self.temperature = temperature
         self.top_p = top_p
         self.top_k = top_k
         self.repetition_penalty = repetition_penalty
+        self.max_retries = max_retries
 
     @staticmethod
-    def extract_text_from_file(file_path: str):
+    def extract_text_from_file(file_path: str, max_pages: Optional[int] = None,
+                               max_chars: Optional[int] = None, pdf_backend: str = "auto"):
         logger.info(f"Starting text extraction from: {file_path}")
         _, ext = os.path.splitext(file_path)
         ext = ext.lower()
 
-        try:
-            if ext == ".pdf":
-                return ResumeParser._extract_text_from_pdf(file_path)
-            elif ext == ".docx":
-                return ResumeParser._extract_text_from_docx(file_path)
-            elif ext == ".doc":
-                return ResumeParser._extract_text_from_doc(file_path)
-            else:
-                logger.error(f"Unsupported file type: {ext}")
-                raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
-        except Exception as e:
-            logger.error(f"Text extraction failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error extracting text: {str(e)}")
+        if ext not in supported_extensions():
+            logger.error(f"Unsupported file type: {ext}")
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
-    @staticmethod
-    def _extract_text_from_pdf(pdf_path):
-        logger.info(f"Starting PDF text extraction from: {pdf_path}")
         try:
-            reader = PdfReader(pdf_path)
-            logger.debug(f"PDF loaded successfully, number of pages: {len(reader.pages)}")
-            
-            text = ""
-            for i, page in enumerate(reader.pages):
-                logger.debug(f"Processing page {i+1}/{len(reader.pages)}")
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            if not text.strip():
-                logger.error("No text content found in PDF")
-                raise ValueError("No text found in the PDF.")
-            
-            logger.info(f"Successfully extracted {len(text)} characters from PDF")
+            text = extract_text(file_path, max_pages=max_pages, max_chars=max_chars, pdf_backend=pdf_backend)
             logger.debug(f"First 100 characters of extracted text: {text[:100]}")
-            return text.strip()
-        except Exception as e:
-            logger.error(f"PDF extraction failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error extracting text from PDF: {str(e)}")
-
-    @staticmethod
-    def _extract_text_from_docx(docx_path):
-        logger.info(f"Starting DOCX text extraction from: {docx_path}")
-        try:
-            doc = docx.Document(docx_path)
-            text = "\n".join([para.text for para in doc.paragraphs])
-            if not text.strip():
-                logger.error("No text content found in DOCX")
-                raise ValueError("No text found in the DOCX file.")
-            logger.info(f"Successfully extracted text from DOCX")
-            return text.strip()
+            return text
         except Exception as e:
-            logger.error(f"DOCX extraction failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error extracting text from DOCX: {str(e)}")
+            logger.error(f"Text extraction failed: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Error extracting text: {str(e)}")
 
     @staticmethod
     def create_prompt(text, parse_type):
@@ -163,7 +141,9 @@ class ResumeParser:
     def generate_response(self, model_name, prompt, max_tokens):
         try:
             logger.info("Starting API call to Together")
-            response = self.client.chat.completions.create(
+            parsed_response, _ = stream_completion(
+                self.client,
+                max_retries=self.max_retries,
                 model=model_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
@@ -171,16 +151,9 @@ class ResumeParser:
                 top_p=self.top_p,
                 top_k=self.top_k,
                 repetition_penalty=self.repetition_penalty,
-                stop=["<|eot_id|>", "<|eom_id|>"],
-                stream=True
+                stop=["<|eot_id|>", "<|eom_id|>"]
             )
-
-            logger.info("API call successful, processing stream response")
-            parsed_response = ""
-            for token in response:
-                if hasattr(token, "choices") and token.choices:
-                    if hasattr(token.choices[0].delta, 'content') and token.choices[0].delta.content is not None:
-                        parsed_response += token.choices[0].delta.content
+            logger.info("API call successful, stream response received")
 
             try:
                 cleaned_response = parsed_response.replace("```json", "").replace("```", "").strip()
@@ -2,15 +2,19 @@ import logging
 import json
 import re
 from typing import Dict, List
+from fastapi import HTTPException
 from together import Together
-import json
+from app.services.llm_client import stream_completion
 
 
 logger = logging.getLogger(__name__)
 
 class CVRankingAssistant:
-    def __init__(self, api_key, model_name, temperature=0.7, top_p=0.7, top_k=50, repetition_penalty=1):
-        self.client = Together(api_key=api_key)
+    def __init__(self, api_key=None, model_name=None, temperature=0.7, top_p=0.7, top_k=50, repetition_penalty=1, client=None,
+                 max_retries=2):
+        # Retries are done (and counted) by stream_completion
+        self.client = client if client is not None else Together(api_key=api_key, max_retries=0)
+        self.max_retries = max_retries
         self.model_name = model_name
         self.temperature = temperature
         self.top_p = top_p
@@ -146,8 +150,11 @@ class CVRankingAssistant:
 
     def rank_cvs(self, job_description: Dict, cvs: List[Dict]) -> Dict:
         prompt = self.generate_prompt(job_description, cvs)
+        parsed_response = ""
         try:
-            response = self.client.chat.completions.create(
+            parsed_response, _ = stream_completion(
+                self.client,
+                max_retries=self.max_retries,
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=2048,
@@ -155,16 +162,9 @@ class CVRankingAssistant:
                 top_p=self.top_p,
                 top_k=self.top_k,
                 repetition_penalty=self.repetition_penalty,
-                stop=["<|eot_id|>", "<|eom_id|>"],
-                stream=True
+                stop=["<|eot_id|>", "<|eom_id|>"]
             )
 
-            parsed_response = ""
-            for token in response:
-                if hasattr(token, "choices") and token.choices:
-                    if hasattr(token.choices[0].delta, 'content') and token.choices[0].delta.content is not None:
-                        parsed_response += token.choices[0].delta.content
-
             # Clean and parse JSON response more robustly
             cleaned_response = parsed_response.strip()
 
@@ -0,0 +1,125 @@
+import asyncio
+import importlib
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException, Request
+from together import Together
+
+from app.config import Settings
+from app.services.cv_parser import ResumeParser
+from app.services.cv_ranker import CVRankingAssistant
+from app.services.text_extractor import available_pdf_backends, normalize_text, supported_extensions
+from app.services.tracing import configure_exporter, shutdown_exporter
+
+logger = logging.getLogger(__name__)
+
+# Checks without which the worker cannot serve any request
+REQUIRED_CHECKS = ("pdf",)
+
+
+class ServiceState:
+    """Per-worker services built once at startup and shared by every request."""
+
+    def __init__(self):
+        self.client: Optional[Together] = None
+        self.parser: Optional[ResumeParser] = None
+        self.ranker: Optional[CVRankingAssistant] = None
+        self.ready = False
+        self.checks: Dict[str, str] = {}
+        self.disabled_extensions: Set[str] = set()
+        self.startup_seconds: Optional[float] = None
+
+    def build(self, settings: Settings):
+        logger.info("Building shared services...")
+        # Retries are done (and counted per span) by stream_completion, not the SDK
+        self.client = Together(api_key=settings.TOGETHER_API_KEY, max_retries=0)
+        self.parser = ResumeParser(client=self.client, max_retries=settings.LLM_MAX_RETRIES)
+        self.ranker = CVRankingAssistant(
+            client=self.client, model_name=settings.MODEL_NAME, max_retries=settings.LLM_MAX_RETRIES
+        )
+        configure_exporter(settings.TRACE_EXPORT_PATH)
+
+    async def warm_up(self, settings: Settings):
+        start_time = time.time()
+
+        self.checks["pdf"] = self._warm_pdf(settings.PDF_BACKEND)
+        self.checks["docx"] = self._warm_docx()
+        if self.checks["docx"] != "ok":
+            # Only DOCX uploads need python-docx; keep serving everything else
+            self.disabled_extensions.add(".docx")
+        if settings.WARMUP_LLM:
+            self.checks["llm"] = await self._warm_llm(settings.WARMUP_LLM_TIMEOUT)
+        else:
+            self.checks["llm"] = "skipped"
+
+        self.startup_seconds = time.time() - start_time
+        self.ready = not self.failed_checks()
+        logger.info(f"Warm-up finished in {self.startup_seconds:.2f}s: {self.checks}")
+
+    def failed_checks(self) -> List[str]:
+        return [name for name in REQUIRED_CHECKS if self.checks.get(name) != "ok"]
+
+    def close(self):
+        self.ready = False
+        self.parser = None
+        self.ranker = None
+        self.client = None
+        shutdown_exporter()
+
+    @staticmethod
+    def _warm_pdf(pdf_backend: str) -> str:
+        # Pay the import cost of the document libraries before the first upload does
+        try:
+            backends = available_pdf_backends()
+            if not backends:
+                logger.error("No PDF backend available")
+                return "failed"
+            if pdf_backend != "auto" and pdf_backend not in backends:
+                logger.error(f"PDF_BACKEND={pdf_backend!r} is not one of the available backends {backends}")
+                return "failed"
+            supported_extensions()
+            normalize_text("warm-\nup  text\n\n\n", dehyphenate=True)
+            logger.info(f"PDF extraction ready, backends: {backends}")
+            return "ok"
+        except Exception as e:
+            logger.error(f"PDF warm-up failed: {str(e)}")
+            return "failed"
+
+    @staticmethod
+    def _warm_docx() -> str:
+        try:
+            importlib.import_module("docx")
+            return "ok"
+        except ImportError as e:
+            logger.warning(f"python-docx is unavailable, DOCX uploads will be rejected: {str(e)}")
+            return "unavailable"
+
+    async def _warm_llm(self, timeout: float) -> str:
+        # A model listing opens the HTTPS connection without spending tokens. The
+        # client's own timeout and retries can run for minutes, which would keep the
+        # worker from booting past gunicorn's timeout, so bound it here.
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.run_in_executor(None, self.client.models.list), timeout)
+            logger.info("LLM connection warmed up")
+            return "ok"
+        except asyncio.TimeoutError:
+            logger.warning(f"LLM warm-up timed out after {timeout}s, continuing degraded")
+            return "degraded"
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed, continuing degraded: {str(e)}")
+            return "degraded"
+
+
+def get_services(request: Request) -> ServiceState:
+    services = getattr(request.app.state, "services", None)
+    if services is None:
+        raise HTTPException(status_code=503, detail="Services are not initialized")
+    if not services.ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Service unavailable: startup checks failed ({', '.join(services.failed_checks())})"
+        )
+    return services
@@ -0,0 +1,58 @@
+import logging
+import time
+
+from app.services.tracing import current_span, record_llm_usage
+
+logger = logging.getLogger(__name__)
+
+# Exception names used by the Together SDK for transient failures that carry no HTTP status
+_RETRYABLE_ERRORS = ("APIConnectionError", "APITimeoutError", "Timeout", "ServiceUnavailableError")
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are worth retrying."""
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in _RETRYABLE_ERRORS
+
+
+def stream_completion(client, max_retries: int = 2, backoff: float = 0.5, **kwargs):
+    """
+    Stream a chat completion and return ``(text, usage)``.
+
+    The shared client is built with ``max_retries=0`` so retries happen here, where they
+    can be counted on the active trace span. A failure mid-stream restarts the request.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = client.chat.completions.create(stream=True, **kwargs)
+            text = ""
+            usage = None
+            for token in response:
+                # Together reports token usage on the final stream chunk
+                if getattr(token, "usage", None) is not None:
+                    usage = token.usage
+                if hasattr(token, "choices") and token.choices:
+                    if hasattr(token.choices[0].delta, 'content') and token.choices[0].delta.content is not None:
+                        text += token.choices[0].delta.content
+            break
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                _record_retries(attempt)
+                raise
+            attempt += 1
+            delay = backoff * 2 ** (attempt - 1)
+            logger.warning(f"LLM call failed ({str(e)}), retry {attempt}/{max_retries} in {delay}s")
+            time.sleep(delay)
+
+    _record_retries(attempt)
+    record_llm_usage(usage, kwargs.get("model"))
+    return text, usage
+
+
+def _record_retries(retries: int):
+    span = current_span()
+    if span is not None:
+        span.set_attribute("retries", retries)
@@ -0,0 +1,221 @@
+import logging
+import os
+import re
+import shutil
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Extension -> extractor callable(path, max_pages, max_chars) -> str
+_EXTRACTORS: Dict[str, Callable[[str, Optional[int], Optional[int]], str]] = {}
+
+# PDF backend name -> extractor callable, in order of preference
+_PDF_BACKENDS: Dict[str, Callable[[str, Optional[int], Optional[int]], str]] = {}
+
+# PDF backend name -> callable reporting whether the backend's library is installed
+_PDF_BACKEND_CHECKS: Dict[str, Callable[[], bool]] = {}
+
+
+def register_extractor(*extensions: str):
+    """Register a text extractor for one or more file extensions (e.g. ".pdf")."""
+    def decorator(func):
+        for ext in extensions:
+            _EXTRACTORS[ext.lower()] = func
+        return func
+    return decorator
+
+
+def register_pdf_backend(name: str, is_available: Callable[[], bool] = lambda: True):
+    """Register a PDF backend. In "auto" mode, available backends registered first are preferred."""
+    def decorator(func):
+        _PDF_BACKENDS[name] = func
+        _PDF_BACKEND_CHECKS[name] = is_available
+        return func
+    return decorator
+
+
+def supported_extensions() -> List[str]:
+    # PDFs are dispatched through the backend registry rather than _EXTRACTORS
+    return sorted({".pdf", *_EXTRACTORS})
+
+
+def available_pdf_backends() -> List[str]:
+    """Return the names of PDF backends whose libraries can be imported, in order of preference."""
+    return [name for name in _PDF_BACKENDS if _PDF_BACKEND_CHECKS[name]()]
+
+
+def get_pdf_backend(name: str) -> Callable[[str, Optional[int], Optional[int]], str]:
+    if name not in _PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}")
+    return _PDF_BACKENDS[name]
+
+
+def normalize_text(text: str, dehyphenate: bool = False) -> str:
+    """
+    Collapse layout whitespace to cut prompt tokens.
+
+    With ``dehyphenate``, words split across a single line break ("experi-\\nence") are
+    re-joined. Only lowercase letters are joined so date ranges like "2019-\\n2021" survive.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+    text = re.sub(r"[ \t\f\v\u00a0]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    if dehyphenate:
+        text = re.sub(r"([a-z])-\n([a-z])", r"\1\2", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def extract_text(file_path: str, max_pages: Optional[int] = None,
+                 max_chars: Optional[int] = None, pdf_backend: str = "auto") -> str:
+    """
+    Extract normalized text from a document using the extractor registered for its extension.
+
+    Extraction stops early once ``max_pages`` pages or ``max_chars`` characters have been read.
+    """
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+
+    # PyMuPDF dehyphenates natively and Word text has no soft hyphens to undo
+    dehyphenate = False
+    if ext == ".pdf":
+        text, backend = _extract_pdf(file_path, max_pages, max_chars, pdf_backend)
+        dehyphenate = backend == "pypdf2"
+    elif ext in _EXTRACTORS:
+        text = _EXTRACTORS[ext](file_path, max_pages, max_chars)
+    else:
+        raise ValueError(f"Unsupported file type: {ext}")
+
+    text = normalize_text(text, dehyphenate=dehyphenate)
+    if max_chars is not None:
+        text = text[:max_chars]
+    if not text:
+        raise ValueError(f"No text found in the {ext.lstrip('.').upper()} file.")
+
+    logger.info(f"Extracted {len(text)} characters from {file_path}")
+    return text
+
+
+def _extract_pdf(file_path, max_pages, max_chars, pdf_backend):
+    if pdf_backend != "auto":
+        return get_pdf_backend(pdf_backend)(file_path, max_pages, max_chars), pdf_backend
+
+    backends = available_pdf_backends()
+    if not backends:
+        raise RuntimeError(f"No PDF backend available; install one of: {', '.join(_PDF_BACKENDS)}")
+
+    last_error = None
+    for name in backends:
+        try:
+            logger.debug(f"Extracting PDF with backend: {name}")
+            return _PDF_BACKENDS[name](file_path, max_pages, max_chars), name
+        except Exception as e:
+            logger.warning(f"PDF backend {name} failed: {str(e)}")
+            last_error = e
+    raise last_error
+
+
+def _has_pymupdf() -> bool:
+    try:
+        import fitz  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _has_pypdf2() -> bool:
+    try:
+        import PyPDF2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _collect_pages(pages, max_pages, max_chars, extract_page):
+    parts = []
+    total = 0
+    for i, page in enumerate(pages):
+        if max_pages is not None and i >= max_pages:
+            logger.debug(f"Stopping PDF extraction at page limit ({max_pages})")
+            break
+        page_text = extract_page(page)
+        if page_text:
+            parts.append(page_text)
+            total += len(page_text)
+        if max_chars is not None and total >= max_chars:
+            logger.debug(f"Stopping PDF extraction at character limit ({max_chars})")
+            break
+    return "\n".join(parts)
+
+
+@register_pdf_backend("pymupdf", _has_pymupdf)
+def _extract_pdf_pymupdf(file_path, max_pages=None, max_chars=None):
+    import fitz
+
+    with fitz.open(file_path) as doc:
+        # Keep the default flags (incl. TEXT_MEDIABOX_CLIP, which drops off-page text)
+        # and content-stream order, which keeps multi-column layouts column by column
+        flags = fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE
+        return _collect_pages(doc, max_pages, max_chars,
+                              lambda page: page.get_text("text", flags=flags))
+
+
+@register_pdf_backend("pypdf2", _has_pypdf2)
+def _extract_pdf_pypdf2(file_path, max_pages=None, max_chars=None):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    return _collect_pages(reader.pages, max_pages, max_chars, lambda page: page.extract_text())
+
+
+@register_extractor(".docx")
+def _extract_docx(file_path, max_pages=None, max_chars=None):
+    import docx
+
+    doc = docx.Document(file_path)
+    parts = []
+    total = 0
+    for para in doc.paragraphs:
+        parts.append(para.text)
+        total += len(para.text)
+        if max_chars is not None and total >= max_chars:
+            break
+    # Resumes frequently lay out sections in tables, which doc.paragraphs skips
+    if max_chars is None or total < max_chars:
+        for table in doc.tables:
+            for row in table.rows:
+                # Merged cells are returned once per grid column they span
+                cells = []
+                for cell in row.cells:
+                    if cells and cell._tc is cells[-1]._tc:
+                        continue
+                    cells.append(cell)
+                row_text = " ".join(cell.text for cell in cells if cell.text)
+                parts.append(row_text)
+                total += len(row_text)
+            if max_chars is not None and total >= max_chars:
+                break
+    return "\n".join(parts)
+
+
+@register_extractor(".doc")
+def _extract_doc(file_path, max_pages=None, max_chars=None):
+    # Legacy Word binaries need an external converter; try the common ones in turn
+    for tool in ("antiword", "catdoc"):
+        executable = shutil.which(tool)
+        if not executable:
+            continue
+        try:
+            result = subprocess.run(
+                [executable, file_path],
+                capture_output=True,
+                timeout=30,
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning(f"{tool} timed out on {file_path}")
+            continue
+        if result.returncode == 0:
+            return result.stdout.decode("utf-8", errors="ignore")
+        logger.warning(f"{tool} failed: {result.stderr.decode('utf-8', errors='ignore')[:200]}")
+    raise RuntimeError("DOC extraction requires antiword or catdoc to be installed")
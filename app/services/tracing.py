@@ -0,0 +1,217 @@
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+# Set by configure_exporter() when the OpenTelemetry SDK is installed
+_tracer = None
+_provider = None
+_export_file = None
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any], otel_span=None):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes)
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+        self.error: Optional[str] = None
+        self._otel_span = otel_span
+
+    @property
+    def duration_ms(self) -> float:
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return (end_time - self.start_time) * 1000
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+        if self._otel_span is not None and value is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def file_span(self) -> Optional["Span"]:
+        span = self
+        while span is not None:
+            if "file" in span.attributes:
+                return span
+            span = span.parent
+        return None
+
+
+class RequestTrace:
+    """Collects the spans of a single request and summarizes their timings and LLM usage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+        self._root = None
+
+    def __enter__(self):
+        # Root span so exported per-file spans share one trace
+        self._root = self.span(self.name)
+        root_span = self._root.__enter__()
+        if root_span._otel_span is not None:
+            self.trace_id = format(root_span._otel_span.get_span_context().trace_id, "032x")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._root.__exit__(exc_type, exc, tb)
+        self.end_time = time.perf_counter()
+        return False
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        if _tracer is not None:
+            otel_context = _tracer.start_as_current_span(name, attributes=_otel_attributes(attributes))
+        else:
+            otel_context = None
+
+        otel_span = otel_context.__enter__() if otel_context is not None else None
+        span = Span(name, parent, attributes, otel_span)
+        self.spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = str(e)
+            if otel_span is not None:
+                from opentelemetry.trace import Status, StatusCode
+
+                otel_span.record_exception(e)
+                otel_span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            span.end_time = time.perf_counter()
+            _current_span.reset(token)
+            if otel_context is not None:
+                otel_span.set_attribute("duration_ms", round(span.duration_ms, 2))
+                otel_context.__exit__(None, None, None)
+
+    def summary(self) -> Dict[str, Any]:
+        # Keyed by the "file" span so uploads sharing a filename stay separate
+        files: Dict[int, Dict[str, Any]] = {}
+        stages: Dict[str, float] = {}
+        prompt_tokens = 0
+        completion_tokens = 0
+        retries = 0
+
+        for span in self.spans:
+            file_span = span.file_span()
+            if file_span is None or span is file_span:
+                continue
+            stages[span.name] = stages.get(span.name, 0.0) + span.duration_ms
+            entry = files.setdefault(id(file_span), {
+                "filename": file_span.attributes["file"],
+                "stages": {},
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "retries": 0
+            })
+            entry["stages"][span.name] = round(entry["stages"].get(span.name, 0.0) + span.duration_ms, 2)
+            entry["prompt_tokens"] += span.attributes.get("llm.prompt_tokens") or 0
+            entry["completion_tokens"] += span.attributes.get("llm.completion_tokens") or 0
+            entry["retries"] += span.attributes.get("retries") or 0
+            if span.error:
+                entry["error"] = span.error
+
+            prompt_tokens += span.attributes.get("llm.prompt_tokens") or 0
+            completion_tokens += span.attributes.get("llm.completion_tokens") or 0
+            retries += span.attributes.get("retries") or 0
+
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": round((end_time - self.start_time) * 1000, 2),
+            "stages": {name: round(ms, 2) for name, ms in stages.items()},
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "files": list(files.values())
+        }
+
+    @staticmethod
+    def server_timing(summary: Dict[str, Any]) -> str:
+        """Render the per-stage totals of a summary() as a Server-Timing header value."""
+        entries = [f"total;dur={summary['total_ms']}"]
+        entries += [f"{name};dur={ms}" for name, ms in summary["stages"].items()]
+        return ", ".join(entries)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def record_llm_usage(usage, model_name: Optional[str] = None):
+    """Attach token usage from a Together response (or final stream chunk) to the current span."""
+    span = _current_span.get()
+    if span is None:
+        return
+    if model_name:
+        span.set_attribute("llm.model", model_name)
+    if usage is None:
+        return
+    span.set_attribute("llm.prompt_tokens", getattr(usage, "prompt_tokens", None))
+    span.set_attribute("llm.completion_tokens", getattr(usage, "completion_tokens", None))
+
+
+def export_path_for_worker(path: str) -> str:
+    """Suffix ``path`` with the process id: "spans.jsonl" -> "spans.<pid>.jsonl"."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}{ext}"
+
+
+def configure_exporter(path: str):
+    """
+    Export spans as OpenTelemetry JSON lines when the OpenTelemetry SDK is installed.
+
+    Each worker writes its own file (see export_path_for_worker) so concurrent workers
+    never interleave partial lines in a shared file.
+    """
+    global _tracer, _provider, _export_file
+    if not path:
+        return
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("opentelemetry-sdk is not installed; span export is disabled")
+        return
+
+    path = export_path_for_worker(path)
+    _export_file = open(path, "a")
+    exporter = ConsoleSpanExporter(
+        out=_export_file,
+        formatter=lambda span: span.to_json(indent=None) + os.linesep
+    )
+    _provider = TracerProvider(resource=Resource.create({"service.name": "cv-processing-api"}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer(__name__)
+    logger.info(f"Exporting trace spans to {path}")
+
+
+def shutdown_exporter():
+    global _tracer, _provider, _export_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _export_file is not None:
+        _export_file.close()
+    _tracer = None
+    _provider = None
+    _export_file = None
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in attributes.items()
+            if isinstance(value, (str, bool, int, float))}
@@ -0,0 +1,68 @@
+"""
+Compare PDF extraction backends on wall-clock time and output size.
+
+Usage:
+    python -m benchmarks.bench_extraction resumes/*.pdf [--repeat 5] [--max-pages 10] [--max-chars 20000]
+
+Token counts are approximated with a word/punctuation split, which tracks
+LLM tokenizer counts closely enough to compare backends against each other.
+"""
+import argparse
+import re
+import statistics
+import time
+
+from app.services.text_extractor import available_pdf_backends, extract_text, get_pdf_backend
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def approx_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def bench_file(path, backend, repeat, max_pages, max_chars, normalize):
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if normalize:
+            text = extract_text(path, max_pages=max_pages, max_chars=max_chars, pdf_backend=backend)
+        else:
+            text = get_pdf_backend(backend)(path, max_pages, max_chars)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), approx_tokens(text), len(text)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("files", nargs="+", help="PDF files to extract")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--max-pages", type=int, default=None)
+    arg_parser.add_argument("--max-chars", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    backends = available_pdf_backends()
+    if not backends:
+        raise SystemExit("No PDF backend installed; install PyMuPDF and/or PyPDF2")
+
+    header = f"{'file':<40} {'backend':<8} {'mode':<6} {'median ms':>10} {'tokens':>8} {'chars':>8}"
+    print(header)
+    print("-" * len(header))
+    for path in args.files:
+        for backend in backends:
+            for normalize in (False, True):
+                mode = "norm" if normalize else "raw"
+                try:
+                    seconds, tokens, chars = bench_file(
+                        path, backend, args.repeat, args.max_pages, args.max_chars, normalize
+                    )
+                except Exception as e:
+                    # e.g. scanned PDFs with no text layer; report the row and keep going
+                    print(f"{path[-40:]:<40} {backend:<8} {mode:<6} {'-':>10} {0:>8} {0:>8}  ({e})")
+                    continue
+                print(f"{path[-40:]:<40} {backend:<8} {mode:<6} {seconds * 1000:>10.1f} {tokens:>8} {chars:>8}")
+
+
+if __name__ == "__main__":
+    main()
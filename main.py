@@ -1,11 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.config import get_settings
-from app.routers import cv_processing
+from app.routers import cv_processing, health
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.logging import RequestLoggingMiddleware
+from app.services.lifecycle import ServiceState
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker before it accepts traffic, so every worker shares
+    # one Together client and starts with warm document libraries.
+    settings = get_settings()
+    services = ServiceState()
+    app.state.services = services
+    services.build(settings)
+    await services.warm_up(settings)
+    if not services.ready:
+        # Fail the worker boot so the problem is visible instead of serving 503s forever
+        raise RuntimeError(f"Startup checks failed: {', '.join(services.failed_checks())}")
+    yield
+    services.close()
 
 def create_application() -> FastAPI:
     settings = get_settings()
@@ -16,7 +34,8 @@ def create_application() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
-        openapi_url="/openapi.json"
+        openapi_url="/openapi.json",
+        lifespan=lifespan
     )
     
     # Add middlewares
@@ -37,6 +56,10 @@ def create_application() -> FastAPI:
         cv_processing.router,
         tags=["CV Processing"]
     )
+    app.include_router(
+        health.router,
+        tags=["Health"]
+    )
     
     return app
 
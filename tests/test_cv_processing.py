@@ -0,0 +1,173 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.services import llm_client, text_extractor
+from app.services.cv_parser import ResumeParser
+from app.services.cv_ranker import CVRankingAssistant
+from app.services.lifecycle import ServiceState
+
+RESUME = {"Name": "Jane Doe", "Skills": ["Python"]}
+
+SCORE = {
+    "Scores": [
+        {
+            "Name": "Jane Doe",
+            "Overall_Score": 80,
+            "Score_Breakdown": {
+                "Skills_Score": 32,
+                "Experience_Score": 24,
+                "Education_Score": 16,
+                "Certification_Score": 8
+            },
+            "Evaluation": {"Pros": ["Python"], "Cons": [], "Job_Fit_Summary": "Good fit"},
+            "Interview_Questions": {
+                "HR_Round": ["q"],
+                "Technical_Round": ["q"],
+                "Cultural_Round": ["q"],
+                "Final_Round": ["q"]
+            },
+            "Recommendation": "Proceed"
+        }
+    ]
+}
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class StubCompletions:
+    """Streams a canned response and reports usage on the final chunk, like Together does."""
+
+    def __init__(self):
+        self.failures = []
+
+    def create(self, messages, **kwargs):
+        if self.failures:
+            raise self.failures.pop(0)
+        prompt = messages[0]["content"]
+        if "CV scoring assistant" in prompt:
+            body, usage = json.dumps(SCORE), SimpleNamespace(prompt_tokens=200, completion_tokens=80)
+        else:
+            body, usage = json.dumps(RESUME), SimpleNamespace(prompt_tokens=100, completion_tokens=50)
+        half = len(body) // 2
+        return iter([_chunk(body[:half]), _chunk(body[half:]), _chunk(usage=usage)])
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("TOGETHER_API_KEY", "test-key")
+    get_settings.cache_clear()
+    # Uploads are written to the working directory while they are processed
+    monkeypatch.chdir(tmp_path)
+
+    def extract_txt(file_path, max_pages=None, max_chars=None):
+        with open(file_path) as f:
+            return f.read()
+    monkeypatch.setitem(text_extractor._EXTRACTORS, ".txt", extract_txt)
+
+    from main import create_application
+
+    app = create_application()
+    monkeypatch.setattr(llm_client.time, "sleep", lambda seconds: None)
+    stub = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions()))
+    services = ServiceState()
+    services.client = stub
+    services.parser = ResumeParser(client=stub)
+    services.ranker = CVRankingAssistant(client=stub, model_name="test-model")
+    services.ready = True
+    app.state.services = services
+
+    yield TestClient(app)
+    get_settings.cache_clear()
+
+
+def _post(client, include_trace=None):
+    files = [
+        ("files", ("cv.txt", b"Jane Doe\nPython developer", "text/plain")),
+        ("files", ("cv.txt", b"Jane Doe\nPython engineer", "text/plain"))
+    ]
+    data = {"job_description": "Python developer"}
+    if include_trace is not None:
+        data["include_trace"] = include_trace
+    return client.post("/parse-and-rank", files=files, data=data)
+
+
+def test_parse_and_rank_reports_cost_headers(client):
+    response = _post(client)
+
+    assert response.status_code == 200
+    assert len(response.headers["X-Trace-Id"]) == 32
+    assert response.headers["X-LLM-Prompt-Tokens"] == "600"
+    assert response.headers["X-LLM-Completion-Tokens"] == "260"
+    server_timing = response.headers["Server-Timing"]
+    for stage in ("total", "upload_read", "extraction", "parse_llm", "score_llm"):
+        assert f"{stage};dur=" in server_timing
+    assert response.json()["trace"] is None
+
+
+def test_parse_and_rank_returns_trace_when_requested(client):
+    response = _post(client, include_trace="true")
+
+    assert response.status_code == 200
+    trace = response.json()["trace"]
+    assert trace["trace_id"] == response.headers["X-Trace-Id"]
+    assert response.headers["Server-Timing"].startswith(f"total;dur={trace['total_ms']}")
+    assert trace["prompt_tokens"] == 600
+    assert trace["completion_tokens"] == 260
+    assert trace["retries"] == 0
+    assert len(trace["files"]) == 2
+    for entry in trace["files"]:
+        assert entry["filename"] == "cv.txt"
+        assert entry["prompt_tokens"] == 300
+        assert entry["completion_tokens"] == 130
+        assert set(entry["stages"]) == {"upload_read", "extraction", "parse_llm", "score_llm"}
+
+
+def test_parse_and_rank_rejects_unsupported_extensions(client):
+    files = [
+        ("files", ("cv.txt", b"Jane Doe\nPython developer", "text/plain")),
+        ("files", ("cv.odt", b"binary", "application/vnd.oasis.opendocument.text"))
+    ]
+    response = client.post("/parse-and-rank", files=files, data={"job_description": "Python developer"})
+
+    assert response.status_code == 200
+    error = response.json()["failed_files"][0]["error"]
+    assert error == "Only DOC, DOCX, PDF, TXT files are supported"
+
+
+def test_parse_and_rank_rejects_docx_when_disabled(client):
+    client.app.state.services.disabled_extensions = {".docx"}
+    files = [
+        ("files", ("cv.txt", b"Jane Doe\nPython developer", "text/plain")),
+        ("files", ("cv.docx", b"binary", "application/octet-stream"))
+    ]
+    response = client.post("/parse-and-rank", files=files, data={"job_description": "Python developer"})
+
+    assert response.status_code == 200
+    assert [parse["filename"] for parse in response.json()["successful_parses"]] == ["cv.txt"]
+    assert response.json()["failed_files"] == [
+        {"filename": "cv.docx", "error": "Only DOC, PDF, TXT files are supported"}
+    ]
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_parse_and_rank_reports_llm_retries(client):
+    client.app.state.services.client.chat.completions.failures = [RateLimitError("rate limited")]
+
+    response = _post(client, include_trace="true")
+
+    assert response.status_code == 200
+    trace = response.json()["trace"]
+    assert trace["retries"] == 1
+    assert [entry["retries"] for entry in trace["files"]] == [1, 0]
+    # Usage is only counted for the attempt that succeeded
+    assert trace["prompt_tokens"] == 600
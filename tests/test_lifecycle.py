@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.services import lifecycle
+from app.services.lifecycle import ServiceState, get_services
+
+
+def test_warm_pdf_fails_on_unknown_pdf_backend(monkeypatch):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: ["pypdf2"])
+    assert ServiceState._warm_pdf("PyMuPDF") == "failed"
+
+
+def test_warm_pdf_fails_when_configured_backend_is_not_installed(monkeypatch):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: ["pypdf2"])
+    assert ServiceState._warm_pdf("pymupdf") == "failed"
+
+
+def test_warm_pdf_fails_without_any_pdf_backend(monkeypatch):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: [])
+    assert ServiceState._warm_pdf("auto") == "failed"
+
+
+class _SlowModels:
+    def list(self):
+        time.sleep(1)
+
+
+class _FailingModels:
+    def list(self):
+        raise ConnectionError("unreachable")
+
+
+def _warm_llm(models, timeout):
+    services = ServiceState()
+    services.client = SimpleNamespace(models=models)
+
+    async def run():
+        start_time = time.time()
+        result = await services._warm_llm(timeout)
+        return result, time.time() - start_time
+
+    return asyncio.run(run())
+
+
+def test_warm_llm_ok():
+    assert _warm_llm(SimpleNamespace(list=lambda: []), 1)[0] == "ok"
+
+
+def test_warm_llm_timeout_is_degraded():
+    result, elapsed = _warm_llm(_SlowModels(), 0.05)
+    assert result == "degraded"
+    assert elapsed < 1
+
+
+def test_warm_llm_error_is_degraded():
+    assert _warm_llm(_FailingModels(), 1)[0] == "degraded"
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("TOGETHER_API_KEY", "test-key")
+    monkeypatch.setenv("WARMUP_LLM", "false")
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
+
+
+def test_missing_docx_only_disables_docx_uploads(monkeypatch, settings):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: ["pypdf2"])
+    monkeypatch.setitem(sys.modules, "docx", None)
+    services = ServiceState()
+
+    asyncio.run(services.warm_up(settings))
+
+    assert services.ready
+    assert services.checks == {"pdf": "ok", "docx": "unavailable", "llm": "skipped"}
+    assert services.disabled_extensions == {".docx"}
+
+
+def test_lifespan_fails_worker_boot_when_pdf_is_unusable(monkeypatch, settings):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: [])
+    from main import create_application
+
+    with pytest.raises(RuntimeError, match="Startup checks failed: pdf"):
+        with TestClient(create_application()):
+            pass
+
+
+def test_lifespan_reports_degraded_docx(monkeypatch, settings):
+    monkeypatch.setattr(lifecycle, "available_pdf_backends", lambda: ["pypdf2"])
+    monkeypatch.setitem(sys.modules, "docx", None)
+    from main import create_application
+
+    with TestClient(create_application()) as client:
+        response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["checks"]["docx"] == "unavailable"
+
+
+def test_get_services_names_failed_checks():
+    services = ServiceState()
+    services.checks = {"pdf": "failed", "docx": "ok"}
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(services=services)))
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_services(request)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == "Service unavailable: startup checks failed (pdf)"
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import is_retryable, stream_completion
+from app.services.tracing import RequestTrace
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _stream(*parts, fail_after=None):
+    for i, part in enumerate(parts):
+        if fail_after is not None and i == fail_after:
+            raise APIConnectionError("connection reset")
+        yield _chunk(part)
+    yield _chunk(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=4))
+
+
+class ScriptedClient:
+    """Plays back one outcome per create() call: an exception to raise or a stream to return."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(llm_client.time, "sleep", lambda seconds: None)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (StatusError(429), True),
+    (StatusError(503), True),
+    (StatusError(400), False),
+    (StatusError(401), False),
+    (APIConnectionError(), True),
+    (TimeoutError(), True),
+    (ValueError(), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retries_are_counted_on_the_active_span():
+    client = ScriptedClient(StatusError(429), StatusError(503), _stream("{", "}"))
+
+    with RequestTrace("parse-and-rank") as trace:
+        with trace.span("file", file="cv.pdf"):
+            with trace.span("parse_llm") as span:
+                text, usage = stream_completion(client, max_retries=2, model="m")
+
+    assert text == "{}"
+    assert client.calls == 3
+    assert span.attributes["retries"] == 2
+    assert span.attributes["llm.prompt_tokens"] == 10
+    assert trace.summary()["retries"] == 2
+    assert trace.summary()["files"][0]["retries"] == 2
+
+
+def test_mid_stream_failure_restarts_without_duplicating_text():
+    client = ScriptedClient(_stream("ab", "cd", fail_after=1), _stream("ab", "cd"))
+
+    text, _ = stream_completion(client, max_retries=1, model="m")
+
+    assert text == "abcd"
+
+
+def test_non_retryable_errors_are_raised_immediately():
+    client = ScriptedClient(StatusError(400))
+
+    with pytest.raises(StatusError):
+        stream_completion(client, max_retries=2, model="m")
+    assert client.calls == 1
+
+
+def test_gives_up_after_max_retries():
+    client = ScriptedClient(StatusError(503), StatusError(503), StatusError(503))
+
+    with RequestTrace("parse-and-rank") as trace:
+        with trace.span("parse_llm") as span:
+            with pytest.raises(StatusError):
+                stream_completion(client, max_retries=2, model="m")
+
+    assert client.calls == 3
+    assert span.attributes["retries"] == 2
@@ -0,0 +1,196 @@
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import text_extractor
+from app.services.text_extractor import _collect_pages, extract_text, normalize_text
+
+
+def test_normalize_text_collapses_whitespace():
+    text = "Senior  Engineer\t\tat  Acme  \n\n\n\n  Python"
+    assert normalize_text(text) == "Senior Engineer at Acme\n\nPython"
+
+
+def test_normalize_text_rejoins_lowercase_hyphenation():
+    assert normalize_text("experi-\nence", dehyphenate=True) == "experience"
+    assert normalize_text("experi- \n ence", dehyphenate=True) == "experience"
+
+
+def test_normalize_text_keeps_date_ranges_and_blank_lines():
+    assert normalize_text("2019-\n2021 at Acme", dehyphenate=True) == "2019-\n2021 at Acme"
+    assert normalize_text("well-\n\n  known", dehyphenate=True) == "well-\n\nknown"
+    assert normalize_text("Jan-\nMar", dehyphenate=True) == "Jan-\nMar"
+
+
+def test_normalize_text_leaves_hyphens_without_dehyphenate():
+    assert normalize_text("self-\nmotivated") == "self-\nmotivated"
+
+
+def test_collect_pages_stops_at_page_limit():
+    seen = []
+
+    def extract_page(page):
+        seen.append(page)
+        return page
+
+    assert _collect_pages(["a", "b", "c"], 2, None, extract_page) == "a\nb"
+    assert seen == ["a", "b"]
+
+
+def test_collect_pages_stops_at_char_limit():
+    seen = []
+
+    def extract_page(page):
+        seen.append(page)
+        return page
+
+    assert _collect_pages(["aaaa", "bbbb", "cccc"], None, 6, extract_page) == "aaaa\nbbbb"
+    assert seen == ["aaaa", "bbbb"]
+
+
+def test_collect_pages_skips_empty_pages():
+    assert _collect_pages(["a", None, "", "b"], None, None, lambda page: page) == "a\nb"
+
+
+@pytest.fixture
+def txt_extractor(monkeypatch):
+    def extract(file_path, max_pages=None, max_chars=None):
+        with open(file_path) as f:
+            return f.read()
+    monkeypatch.setitem(text_extractor._EXTRACTORS, ".txt", extract)
+
+
+def test_extract_text_truncates_to_max_chars(tmp_path, txt_extractor):
+    path = tmp_path / "cv.txt"
+    path.write_text("abcdef " * 10)
+    assert extract_text(str(path), max_chars=10) == "abcdef abc"
+
+
+def test_extract_text_raises_on_empty_text(tmp_path, txt_extractor):
+    path = tmp_path / "cv.txt"
+    path.write_text("  \n\n  ")
+    with pytest.raises(ValueError, match="No text found in the TXT file"):
+        extract_text(str(path))
+
+
+def test_extract_text_rejects_unknown_extension(tmp_path):
+    path = tmp_path / "cv.xyz"
+    path.write_text("text")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        extract_text(str(path))
+
+
+def test_auto_backend_falls_back_on_failure(monkeypatch, tmp_path):
+    calls = []
+
+    def failing(file_path, max_pages=None, max_chars=None):
+        calls.append("pymupdf")
+        raise RuntimeError("broken PDF")
+
+    def working(file_path, max_pages=None, max_chars=None):
+        calls.append("pypdf2")
+        return "experi-\nence in 2019-\n2021"
+
+    monkeypatch.setitem(text_extractor._PDF_BACKENDS, "pymupdf", failing)
+    monkeypatch.setitem(text_extractor._PDF_BACKENDS, "pypdf2", working)
+    monkeypatch.setattr(text_extractor, "available_pdf_backends", lambda: ["pymupdf", "pypdf2"])
+
+    text = extract_text(str(tmp_path / "cv.pdf"), pdf_backend="auto")
+
+    assert calls == ["pymupdf", "pypdf2"]
+    # PyPDF2 output is dehyphenated, date ranges are not
+    assert text == "experience in 2019-\n2021"
+
+
+def test_auto_backend_raises_last_error_when_all_fail(monkeypatch, tmp_path):
+    def failing(file_path, max_pages=None, max_chars=None):
+        raise RuntimeError("broken PDF")
+
+    monkeypatch.setitem(text_extractor._PDF_BACKENDS, "pypdf2", failing)
+    monkeypatch.setattr(text_extractor, "available_pdf_backends", lambda: ["pypdf2"])
+
+    with pytest.raises(RuntimeError, match="broken PDF"):
+        extract_text(str(tmp_path / "cv.pdf"))
+
+
+def test_pymupdf_output_is_not_dehyphenated_again(monkeypatch, tmp_path):
+    monkeypatch.setitem(text_extractor._PDF_BACKENDS, "pymupdf",
+                        lambda file_path, max_pages=None, max_chars=None: "self-\nmotivated")
+
+    assert extract_text(str(tmp_path / "cv.pdf"), pdf_backend="pymupdf") == "self-\nmotivated"
+
+
+def test_get_pdf_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown PDF backend"):
+        text_extractor.get_pdf_backend("PyMuPDF")
+
+
+def test_auto_mode_tries_registered_backends_in_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(text_extractor, "_PDF_BACKENDS", {})
+    monkeypatch.setattr(text_extractor, "_PDF_BACKEND_CHECKS", {})
+
+    @text_extractor.register_pdf_backend("missing", lambda: False)
+    def missing(file_path, max_pages=None, max_chars=None):
+        raise AssertionError("unavailable backends are never tried")
+
+    @text_extractor.register_pdf_backend("custom")
+    def custom(file_path, max_pages=None, max_chars=None):
+        return "custom text"
+
+    assert text_extractor.available_pdf_backends() == ["custom"]
+    assert extract_text(str(tmp_path / "cv.pdf")) == "custom text"
+
+
+def _fake_doc_tools(monkeypatch, installed, run):
+    monkeypatch.setattr(text_extractor.shutil, "which",
+                        lambda tool: f"/usr/bin/{tool}" if tool in installed else None)
+    monkeypatch.setattr(text_extractor.subprocess, "run", run)
+
+
+def test_doc_uses_antiword(monkeypatch, tmp_path):
+    def run(args, **kwargs):
+        return SimpleNamespace(returncode=0, stdout=b"Jane  Doe\n", stderr=b"")
+    _fake_doc_tools(monkeypatch, {"antiword", "catdoc"}, run)
+
+    assert extract_text(str(tmp_path / "cv.doc")) == "Jane Doe"
+
+
+@pytest.mark.parametrize("antiword_failure", ["timeout", "exit"])
+def test_doc_falls_back_to_catdoc(monkeypatch, tmp_path, antiword_failure):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args[0])
+        if args[0].endswith("antiword"):
+            if antiword_failure == "timeout":
+                raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+            return SimpleNamespace(returncode=1, stdout=b"", stderr=b"not a Word document")
+        return SimpleNamespace(returncode=0, stdout=b"Jane Doe", stderr=b"")
+    _fake_doc_tools(monkeypatch, {"antiword", "catdoc"}, run)
+
+    assert extract_text(str(tmp_path / "cv.doc")) == "Jane Doe"
+    assert calls == ["/usr/bin/antiword", "/usr/bin/catdoc"]
+
+
+def test_doc_without_converter_raises(monkeypatch, tmp_path):
+    _fake_doc_tools(monkeypatch, set(), None)
+
+    with pytest.raises(RuntimeError, match="antiword or catdoc"):
+        extract_text(str(tmp_path / "cv.doc"))
+
+
+def test_docx_reads_tables_once_per_merged_cell(tmp_path):
+    docx = pytest.importorskip("docx")
+
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    table = document.add_table(rows=2, cols=3)
+    header = table.cell(0, 0).merge(table.cell(0, 2))
+    header.text = "Work Experience"
+    for cell, text in zip(table.rows[1].cells, ["Acme", "Engineer", "2019-2021"]):
+        cell.text = text
+    path = tmp_path / "cv.docx"
+    document.save(str(path))
+
+    assert extract_text(str(path)) == "Jane Doe\nWork Experience\nAcme Engineer 2019-2021"
@@ -0,0 +1,115 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.tracing import RequestTrace, record_llm_usage
+
+
+def _usage(prompt_tokens, completion_tokens):
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+def test_summary_aggregates_stages_and_tokens_per_file():
+    with RequestTrace("parse-and-rank") as trace:
+        with trace.span("file", file="a.pdf"):
+            with trace.span("extraction"):
+                pass
+            with trace.span("parse_llm"):
+                record_llm_usage(_usage(100, 20), "model")
+            with trace.span("score_llm"):
+                record_llm_usage(_usage(50, 10))
+        with trace.span("file", file="b.pdf"):
+            with trace.span("parse_llm"):
+                record_llm_usage(_usage(7, 3))
+
+    summary = trace.summary()
+
+    assert summary["prompt_tokens"] == 157
+    assert summary["completion_tokens"] == 33
+    assert set(summary["stages"]) == {"extraction", "parse_llm", "score_llm"}
+    assert [f["filename"] for f in summary["files"]] == ["a.pdf", "b.pdf"]
+    assert summary["files"][0]["prompt_tokens"] == 150
+    assert summary["files"][0]["completion_tokens"] == 30
+    assert set(summary["files"][0]["stages"]) == {"extraction", "parse_llm", "score_llm"}
+    assert summary["files"][1]["prompt_tokens"] == 7
+
+
+def test_usage_is_recorded_on_the_innermost_span():
+    with RequestTrace("parse-and-rank") as trace:
+        with trace.span("file", file="a.pdf") as file_span:
+            with trace.span("parse_llm") as llm_span:
+                record_llm_usage(_usage(1, 2), "model")
+
+    assert llm_span.attributes["llm.prompt_tokens"] == 1
+    assert llm_span.attributes["llm.model"] == "model"
+    assert "llm.prompt_tokens" not in file_span.attributes
+
+
+def test_uploads_with_the_same_filename_are_not_merged():
+    with RequestTrace("parse-and-rank") as trace:
+        for tokens in (10, 20):
+            with trace.span("file", file="cv.pdf"):
+                with trace.span("parse_llm"):
+                    record_llm_usage(_usage(tokens, 1))
+
+    files = trace.summary()["files"]
+
+    assert len(files) == 2
+    assert [f["prompt_tokens"] for f in files] == [10, 20]
+
+
+def test_stage_errors_are_reported_and_reraised():
+    with RequestTrace("parse-and-rank") as trace:
+        with pytest.raises(ValueError):
+            with trace.span("file", file="scan.pdf"):
+                with trace.span("extraction"):
+                    raise ValueError("No text found in the PDF file.")
+
+    assert trace.summary()["files"][0]["error"] == "No text found in the PDF file."
+
+
+def test_record_llm_usage_without_active_span_is_a_no_op():
+    record_llm_usage(_usage(1, 1), "model")
+
+    with RequestTrace("parse-and-rank") as trace:
+        pass
+    record_llm_usage(_usage(1, 1), "model")
+
+    assert trace.summary()["prompt_tokens"] == 0
+
+
+def test_summary_is_stable_after_the_trace_ends():
+    with RequestTrace("parse-and-rank") as trace:
+        with trace.span("file", file="a.pdf"):
+            with trace.span("extraction"):
+                pass
+
+    summary = trace.summary()
+
+    assert trace.summary()["total_ms"] == summary["total_ms"]
+    assert RequestTrace.server_timing(summary).startswith(f"total;dur={summary['total_ms']}, ")
+    assert "extraction;dur=" in RequestTrace.server_timing(summary)
+
+
+def test_exported_spans_flag_failed_stages(tmp_path):
+    pytest.importorskip("opentelemetry.sdk")
+    from app.services.tracing import configure_exporter, shutdown_exporter
+
+    export_path = tmp_path / f"spans.{os.getpid()}.jsonl"
+    configure_exporter(str(tmp_path / "spans.jsonl"))
+    try:
+        with RequestTrace("parse-and-rank") as trace:
+            with pytest.raises(ValueError):
+                with trace.span("file", file="scan.pdf"):
+                    with trace.span("extraction"):
+                        raise ValueError("No text found in the PDF file.")
+    finally:
+        shutdown_exporter()
+
+    spans = {span["name"]: span for span in map(json.loads, export_path.read_text().splitlines())}
+
+    assert spans["extraction"]["status"]["status_code"] == "ERROR"
+    assert spans["parse-and-rank"]["status"]["status_code"] == "UNSET"
+    assert format(int(spans["extraction"]["context"]["trace_id"], 16), "032x") == trace.trace_id